@@ -128,6 +128,12 @@ class EventLoop(object):
             return True
         return False
 
+    def call_threadsafe(self, callback, *args):
+        """ Schedules the `callback` to run in the event loop thread.
+        This is only method what can be called from other threads.
+        """
+        self._loop.call_soon_threadsafe(callback, *args)
+
 
 class EventBuffer(object):
     """ Base event-driven I/O stream buffer
@@ -5,9 +5,12 @@ import errno
 import socket
 import logging
 from functools import partial
+from itertools import zip_longest
+from collections import deque, OrderedDict
 from .switching import Dispatcher, Awaitable, READ, WRITE
 from .iostream import SocketStream
 from .utils import bind_sockets
+from .resolver import Resolver
 
 
 class TCPServer(object):
@@ -68,10 +71,11 @@ class TCPServer(object):
         """
         return self._disp is not None
 
-    def bind(self, port, address=None, *, backlog=128, reuse_port=False):
+    def bind(self, port, address=None, *, backlog=128, reuse_port=False, family=socket.AF_INET):
         """ Binds this server to the given port on the given address.
         """
-        for socket_ in bind_sockets(port, address, backlog=backlog, reuse_port=reuse_port):
+        for socket_ in bind_sockets(port, address, backlog=backlog,
+                                    reuse_port=reuse_port, family=family):
             if self.active:
                 acceptor = self._acceptor_factory(self._disp, socket_, self._accept)
                 if (port, address) not in self._acceptors:
@@ -128,31 +132,81 @@ class TCPClient(object):
     """ Async TCP client
     """
 
-    def __init__(self, disp, block_size=1024, buffer_size=65536):
+    def __init__(self, disp, block_size=1024, buffer_size=65536, *, resolver=None, family=0):
         self._disp = disp
+        self._family = family
+        self._resolver = resolver or Resolver(disp)
         self._stream_params = (block_size, buffer_size)
 
-    def connect(self, stream_handler, address, *, timeout=None):
-        """ See for detail `TCPClient.connect` """
+    def connect(self, stream_handler, address, *, timeout=None, stagger=None):
+        """ Returns the awaitable to asynchronously connect to a given `address`
+        and to run `stream_handler` with connected stream, result of awaitable
+        is result of `stream_handler`.
+
+        The `address` is pair of `(host, port)` or list of such pairs of replicas.
+        Resolved addresses are tried in turn, IPv6 interleaved with IPv4. If `stagger`
+        is set the next attempt starts after `stagger` seconds without waiting when
+        previous one fails, first connected attempt wins and the rest are cancelled.
+
+        Raises:
+            TimeoutError: `timeout` is defined and elapsed.
+            IOError: all attempts to connect have failed.
+        """
         assert callable(stream_handler)
         timeout = timeout or 0
         assert isinstance(timeout, (int, float))
         timeout = timeout if timeout >= 0 else -1
-        return self._ConnectAwaitable(self, stream_handler, address, timeout)
+        assert stagger is None or (isinstance(stagger, (int, float)) and stagger >= 0)
+        return self._ConnectAwaitable(self, stream_handler, address, timeout, stagger)
 
     class _ConnectAwaitable(Awaitable):
         """ Awaitable for `TCPClient.connect`
         """
 
-        def __init__(self, client, stream_handler, address, timeout):
-            self._socket = None
+        def __init__(self, client, stream_handler, address, timeout, stagger):
+            self._error = None
             self._future = None
             self._client = client
+            self._stagger = stagger
             self._address = address
+            self._attempts = dict()
+            self._resolving = dict()
+            self._candidates = deque()
+            self._timeout_handle = None
+            self._stagger_handle = None
             self._stream_handler = stream_handler
             super().__init__(client._disp, address, timeout)
 
-        def _on_connect(self, revents):
+        def _on_resolve(self, key, result):
+            self._resolving.pop(key, None)
+            if isinstance(result, BaseException):
+                self._error = result
+            else:
+                self._candidates.extend(_interleave(result))
+            if not self._attempts:
+                self._next_attempt()
+            else:
+                self._setup_stagger()
+
+        def _on_stagger(self, _):
+            self._stagger_handle = None
+            self._next_attempt()
+
+        def _on_ready(self, socket_, revents):
+            loop = self._client._disp._loop
+            loop.cancel_io(self._attempts.pop(socket_))
+            error = socket_.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if error:
+                socket_.close()
+                self._error = IOError(error, os.strerror(error))
+                if self._stagger_handle is not None:
+                    loop.cancel_timer(self._stagger_handle)
+                    self._stagger_handle = None
+                self._next_attempt()
+            else:
+                self._on_connect(socket_)
+
+        def _on_connect(self, result):
 
             def done_callback(future):
                 try:
@@ -162,56 +216,103 @@ class TCPClient(object):
                     self._callback(exc)
 
             self._cancel(*self._args)
-            if revents == WRITE:
+            if isinstance(result, socket.socket):
                 # create connection
                 disp = self._client._disp
                 block_size, buffer_size = self._client._stream_params
-                stream = SocketStream(disp, self._socket, block_size, buffer_size)
+                stream = SocketStream(disp, result, block_size, buffer_size)
                 self._future = disp.submit(self._stream_handler, stream, self._address)
                 if self._future.done():
                     done_callback(self._future)
                 else:
                     self._future.add_done_callback(done_callback)
             else:
-                if self._socket is not None:
-                    try:
-                        self._socket.shutdown(socket.SHUT_RDWR)
-                    except: pass
-                    finally:
-                        self._socket.close()
-                if not isinstance(revents, BaseException):
-                    revents = IOError("Some error while connect")
-                self._callback(revents)
+                if not isinstance(result, BaseException):
+                    result = IOError("Some error while connect")
+                self._callback(result)
+
+        def _next_attempt(self):
+            self._start_attempt()
+            if not (self._attempts or self._candidates or self._resolving):
+                self._on_connect(self._error)
+
+        def _start_attempt(self):
+            loop = self._client._disp._loop
+            while self._candidates:
+                socket_ = None
+                family, sockaddr = self._candidates.popleft()
+                try:
+                    socket_ = socket.socket(family, socket.SOCK_STREAM)
+                    socket_.setblocking(0)
+                    error = socket_.connect_ex(sockaddr)
+                    if error not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+                        raise IOError(error, os.strerror(error))
+                    self._attempts[socket_] = loop.setup_io(partial(self._on_ready, socket_),
+                                                            socket_.fileno(), WRITE)
+                    break
+                except IOError as exc:
+                    self._error = exc
+                    if socket_ is not None:
+                        socket_.close()
+            self._setup_stagger()
+
+        def _setup_stagger(self):
+            if (self._stagger is not None and self._stagger_handle is None and
+                    self._attempts and self._candidates):
+                loop = self._client._disp._loop
+                self._stagger_handle = loop.setup_timer(self._on_stagger, self._stagger)
 
         def _setup(self, address, timeout):
             loop = self._client._disp._loop
-            ready_handle = timeout_handle = None
             try:
-                # self._socket = socket.socket(type=socket.SOCK_STREAM)
-                self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self._socket.setblocking(0)
-                self._socket.settimeout(0)
                 if timeout < 0:
                     raise TimeoutError("I/O timeout")
                 elif timeout > 0:
-                    timeout_handle = loop.setup_timer(self._on_connect, timeout)
-                self._socket.connect_ex(address)
-                error = self._socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
-                if error:
-                    raise(IOError(error, os.strerror(error)))
-                ready_handle = loop.setup_io(self._on_connect, self._socket.fileno(), WRITE)
-                return None, ready_handle, timeout_handle
+                    self._timeout_handle = loop.setup_timer(self._on_connect, timeout)
+                for host, port in (address if isinstance(address, list) else [address]):
+                    key = (host, port, self._client._family)
+                    if key not in self._resolving:
+                        callback = partial(self._on_resolve, key)
+                        addresses = self._client._resolver.setup(callback, *key)
+                        if addresses is None:
+                            self._resolving[key] = callback
+                        else:
+                            self._candidates.extend(_interleave(addresses))
+                self._start_attempt()
+                if not (self._attempts or self._candidates or self._resolving):
+                    raise self._error or IOError(errno.EADDRNOTAVAIL,
+                                                 os.strerror(errno.EADDRNOTAVAIL))
+                return None,
             except Exception as exc:
-                return exc, ready_handle, timeout_handle
+                return exc,
 
-        def _cancel(self, ready_handle=None, timeout_handle=None):
+        def _cancel(self):
             loop = self._client._disp._loop
             if self._future is None:
-                if ready_handle is not None:
+                for (host, port, family), callback in self._resolving.items():
+                    self._client._resolver.cancel(callback, host, port, family)
+                self._resolving.clear()
+                for socket_, ready_handle in self._attempts.items():
                     loop.cancel_io(ready_handle)
-                if timeout_handle is not None:
-                    loop.cancel_timer(timeout_handle)
+                    socket_.close()
+                self._attempts.clear()
+                self._candidates.clear()
+                if self._stagger_handle is not None:
+                    loop.cancel_timer(self._stagger_handle)
+                    self._stagger_handle = None
+                if self._timeout_handle is not None:
+                    loop.cancel_timer(self._timeout_handle)
+                    self._timeout_handle = None
             else:
                 # connection present
                 if self._future.running():
                     self._future.cancel()
+
+
+def _interleave(addresses):
+    """ Interleaves addresses of different families """
+    families = OrderedDict()
+    for family, sockaddr in addresses:
+        families.setdefault(family, list()).append((family, sockaddr))
+    return [item for items in zip_longest(*families.values())
+            for item in items if item is not None]
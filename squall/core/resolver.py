@@ -0,0 +1,153 @@
+""" Async DNS resolver
+"""
+import socket
+from time import monotonic
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from .switching import Awaitable
+
+
+class Resolver(object):
+    """ Async DNS resolver
+
+    Runs `getaddrinfo` lookups in a thread pool off the event loop thread,
+    coalesces concurrent lookups of the same name and caches results
+    with a TTL and LRU eviction.
+    """
+
+    def __init__(self, disp, *, ttl=300.0, max_size=1024, max_workers=4, getaddrinfo=None):
+        assert isinstance(ttl, (int, float)) and ttl >= 0
+        assert isinstance(max_size, int) and max_size > 0
+        self._disp = disp
+        self._ttl = ttl
+        self._max_size = max_size
+        self._max_workers = max_workers
+        self._getaddrinfo = getaddrinfo or socket.getaddrinfo
+        self._executor = None
+        self._cache = OrderedDict()
+        self._pending = dict()
+
+    @property
+    def cache_size(self):
+        """ Number of cached names """
+        return len(self._cache)
+
+    def clear(self):
+        """ Drops all cached results.
+        """
+        self._cache.clear()
+
+    def setup(self, callback, host, port, family=0):
+        """ Sets up to run the `callback` with a resolved list of
+        `(family, sockaddr)` when lookup for a given `host` has done.
+
+        Returns:
+            list of addresses if it is already known, otherwise `None`.
+        """
+        key = (host, port, family)
+        addresses = self._numeric(host, port, family)
+        if addresses is not None:
+            return addresses
+        if key in self._cache:
+            expires, addresses = self._cache[key]
+            if expires > monotonic():
+                self._cache.move_to_end(key)
+                return addresses
+            del self._cache[key]
+        if key in self._pending:
+            self._pending[key].append(callback)
+        else:
+            self._pending[key] = [callback]
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self._max_workers)
+            future = self._executor.submit(self._getaddrinfo, host, port,
+                                           family, socket.SOCK_STREAM)
+            future.add_done_callback(lambda future: self._disp._loop.call_threadsafe(
+                self._on_resolved, key, future))
+        return None
+
+    def cancel(self, callback, host, port, family=0):
+        """ Cancels callback which was setup with `Resolver.setup`.
+        Lookup itself is not interrupted and its result will be cached.
+        """
+        callbacks = self._pending.get((host, port, family))
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+
+    def resolve(self, host, port, family=0, *, timeout=None):
+        """ Returns the awaitable to asynchronously resolve a given `host`
+        to the list of `(family, sockaddr)`.
+
+        Raises:
+            TimeoutError: `timeout` is defined and elapsed.
+            socket.gaierror: if lookup failed.
+        """
+        timeout = timeout or 0
+        timeout = timeout if timeout >= 0 else -1
+        assert isinstance(timeout, (int, float))
+        return _ResolveAwaitable(self._disp, self, host, port, family, timeout)
+
+    def close(self):
+        """ Cleanups resolver and shutdowns its thread pool.
+        """
+        self._cache.clear()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    @staticmethod
+    def _numeric(host, port, family):
+        try:
+            info = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM,
+                                      0, socket.AI_NUMERICHOST)
+            return _addresses(info)
+        except socket.gaierror:
+            return None
+
+    def _on_resolved(self, key, future):
+        callbacks = self._pending.pop(key, ())
+        try:
+            result = _addresses(future.result())
+            if self._ttl > 0:
+                self._cache[key] = (monotonic() + self._ttl, result)
+                while len(self._cache) > self._max_size:
+                    self._cache.popitem(last=False)
+        except Exception as exc:
+            result = exc
+        for callback in callbacks:
+            callback(result)
+
+
+def _addresses(info):
+    result = list()
+    for family, _, _, _, sockaddr in info:
+        if (family, sockaddr) not in result:
+            result.append((family, sockaddr))
+    return result
+
+
+class _ResolveAwaitable(Awaitable):
+    """ Awaitable that returns `Resolver.resolve`
+    """
+
+    def __init__(self, disp, resolver, host, port, family, timeout):
+        self._resolver = resolver
+        super().__init__(disp, host, port, family, timeout)
+
+    def _setup(self, host, port, family, timeout):
+        timeout_handle = None
+        try:
+            if timeout < 0:
+                raise TimeoutError("DNS timeout")
+            elif timeout > 0:
+                timeout_handle = self._loop.setup_timer(self._callback, timeout)
+            result = self._resolver.setup(self._callback, host, port, family)
+            return result, (host, port, family), timeout_handle
+        except Exception as exc:
+            return exc, (host, port, family), timeout_handle
+
+    def _cancel(self, key, timeout_handle=None):
+        if timeout_handle is not None:
+            self._loop.cancel_timer(timeout_handle)
+        self._resolver.cancel(self._callback, *key)
@@ -36,10 +36,10 @@ class Addr(tuple):
             return "{}:{}".format(*self)
 
 
-def bind_sockets(port, address=None, *, backlog=127, reuse_port=False):
+def bind_sockets(port, address=None, *, backlog=127, reuse_port=False, family=socket.AF_INET):
     """ Binds sockets """
     sockets = list()
-    info = socket.getaddrinfo(address, port, socket.AF_INET,
+    info = socket.getaddrinfo(address, port, family,
                               socket.SOCK_STREAM, 0, socket.AI_PASSIVE)
     for *args, _, sockaddr in set(info):
         try:
@@ -54,6 +54,8 @@ def bind_sockets(port, address=None, *, backlog=127, reuse_port=False):
             socket_.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
         if os.name != 'nt':
             socket_.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if socket_.family == socket.AF_INET6 and hasattr(socket, "IPPROTO_IPV6"):
+            socket_.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 1)
         socket_.setblocking(0)
         socket_.bind(sockaddr)
         socket_.listen(backlog)
@@ -1,3 +1,5 @@
+import time
+import socket
 import pytest
 import logging
 from functools import partial
@@ -92,5 +94,59 @@ def test_client_server(callog):
     ]
 
 
+def test_connect_racing(callog):
+    blackhole = socket.socket()
+    blackhole.bind(('127.0.0.1', 0))
+    blackhole.listen(0)
+    blackhole_addr = blackhole.getsockname()
+    backlog = socket.socket()
+    backlog.setblocking(0)
+    backlog.connect_ex(blackhole_addr)
+    refused = socket.socket()
+    refused.bind(('127.0.0.1', 0))
+    refused_addr = refused.getsockname()
+    refused.close()
+
+    async def stream_handler(disp, stream, address):
+        try:
+            stream.write(b'PING\r\n')
+            return await stream.read_until(b'\r\n', timeout=0.5)
+        finally:
+            stream.close()
+
+    async def client_request(disp, address, **kwargs):
+        started = time.time()
+        try:
+            client = TCPClient(disp)
+            result = await client.connect(stream_handler, address, timeout=0.5, **kwargs)
+        except Exception as exc:
+            result = type(exc)
+        return result, round(time.time() - started, 1)
+
+    async def start_requests(disp):
+        server_addr = ('::1', 22078)
+        for address, kwargs in [
+                ([refused_addr, server_addr], {}),
+                ([blackhole_addr, server_addr], {}),
+                ([blackhole_addr, server_addr], {'stagger': 0.1}),
+                ([refused_addr], {})]:
+            callog.append(await disp.submit(client_request, address, **kwargs))
+        disp.stop()
+
+    server = EchoServer(start_requests)
+    server.bind(22078, '::1', family=socket.AF_INET6)
+    server.start()
+    backlog.close()
+    blackhole.close()
+
+    print(callog)
+    assert callog == [
+        (b'PING\r\n', 0.0),
+        (TimeoutError, 0.5),
+        (b'PING\r\n', 0.1),
+        (ConnectionRefusedError, 0.0),
+    ]
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
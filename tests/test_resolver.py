@@ -0,0 +1,67 @@
+import time
+import socket
+import pytest
+from squall.core import Dispatcher
+from squall.core.resolver import Resolver
+
+
+@pytest.yield_fixture
+def callog():
+    _callog = list()
+    yield _callog
+
+
+def test_resolver(callog):
+    lookups = list()
+
+    def getaddrinfo(host, port, family, type_):
+        lookups.append(host)
+        time.sleep(0.1)
+        if host == 'bad.example':
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return [(socket.AF_INET, type_, 6, '', ('10.0.0.{}'.format(len(lookups)), port))]
+
+    async def lookup(disp, resolver, N, host, timeout=None):
+        try:
+            result = await resolver.resolve(host, 80, timeout=timeout)
+            callog.append((N, result))
+        except Exception as exc:
+            callog.append((N, type(exc)))
+
+    async def main(disp):
+        resolver = Resolver(disp, ttl=0.3, max_size=2, getaddrinfo=getaddrinfo)
+        futures = [disp.submit(lookup, resolver, N, 'a.example') for N in range(3)]
+        futures.append(disp.submit(lookup, resolver, 3, 'a.example', 0.05))
+        await disp.complete(*futures, timeout=1.0)
+        disp.submit(lookup, resolver, 4, 'a.example')
+        disp.submit(lookup, resolver, 5, '127.0.0.1')
+        await disp.complete(disp.submit(lookup, resolver, 6, 'bad.example'), timeout=1.0)
+        await disp.complete(disp.submit(lookup, resolver, 7, 'b.example'), timeout=1.0)
+        await disp.complete(disp.submit(lookup, resolver, 8, 'c.example'), timeout=1.0)
+        callog.append(('cache_size', resolver.cache_size))
+        await disp.sleep(0.35)
+        await disp.complete(disp.submit(lookup, resolver, 9, 'c.example'), timeout=1.0)
+        resolver.close()
+        disp.stop()
+
+    disp = Dispatcher()
+    disp.submit(main)
+    disp.start()
+
+    print(callog)
+    assert callog[0] == (3, TimeoutError)
+    assert sorted(callog[1:4]) == [(N, [(socket.AF_INET, ('10.0.0.1', 80))]) for N in range(3)]
+    assert callog[4:] == [
+        (4, [(socket.AF_INET, ('10.0.0.1', 80))]),
+        (5, [(socket.AF_INET, ('127.0.0.1', 80))]),
+        (6, socket.gaierror),
+        (7, [(socket.AF_INET, ('10.0.0.3', 80))]),
+        (8, [(socket.AF_INET, ('10.0.0.4', 80))]),
+        ('cache_size', 2),
+        (9, [(socket.AF_INET, ('10.0.0.5', 80))]),
+    ]
+    assert lookups == ['a.example', 'bad.example', 'b.example', 'c.example', 'c.example']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])